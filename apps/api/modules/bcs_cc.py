@@ -18,6 +18,8 @@ WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
 SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
 """
 import json
+import threading
+import time
 
 from django.conf import settings
 from django.utils.translation import ugettext_lazy as _
@@ -27,15 +29,42 @@ from apps.api.modules.utils import add_esb_info_before_request
 from config.domains import BCS_CC_APIGATEWAY_ROOT
 from apps.api.base import DataAPI
 
+# access_token 缓存最长时间, 并提前过期以免使用即将失效的 token
+BKSSM_ACCESS_TOKEN_MAX_CACHE_TIME = 60 * 60
+BKSSM_ACCESS_TOKEN_EXPIRE_AHEAD_TIME = 60
 
-def bcs_cc_before_request(params):
-    params = add_esb_info_before_request(params)
-    if settings.BCS_CC_SSM_SWITCH == "on":
+# access_token 只缓存在进程内存中, 不落地到共享缓存
+_TOKEN_CACHE = {"value": None, "exp": 0.0}
+_TOKEN_LOCK = threading.Lock()
+
+
+def get_bkssm_access_token() -> str:
+    """获取bkssm access_token, 有效期内复用缓存, 避免每次请求bcs cc都调用bkssm"""
+    if time.monotonic() < _TOKEN_CACHE["exp"]:
+        return _TOKEN_CACHE["value"]
+    with _TOKEN_LOCK:
+        # 加锁后再次检查, 避免并发时重复获取
+        now = time.monotonic()
+        if now < _TOKEN_CACHE["exp"]:
+            return _TOKEN_CACHE["value"]
         bkssm_access_token = BkSSMApi.get_access_token(
             {"grant_type": "client_credentials", "id_provider": "client", "env_name": "prod"}
         )
         access_token = bkssm_access_token["access_token"]
-        params["X-BKAPI-AUTHORIZATION"] = json.dumps({"access_token": access_token})
+        cache_time = min(
+            int(bkssm_access_token.get("expires_in", 0)) - BKSSM_ACCESS_TOKEN_EXPIRE_AHEAD_TIME,
+            BKSSM_ACCESS_TOKEN_MAX_CACHE_TIME,
+        )
+        if cache_time > 0:
+            _TOKEN_CACHE["value"] = access_token
+            _TOKEN_CACHE["exp"] = now + cache_time
+        return access_token
+
+
+def bcs_cc_before_request(params):
+    params = add_esb_info_before_request(params)
+    if settings.BCS_CC_SSM_SWITCH == "on":
+        params["X-BKAPI-AUTHORIZATION"] = json.dumps({"access_token": get_bkssm_access_token()})
     return params
 
 
@@ -55,54 +84,48 @@ class _BcsCcApi(object):
 
     def __init__(self):
         bcs_cc_url = settings.BCS_CC_APIGATEWAY_HOST if settings.IS_K8S_DEPLOY_MODE else BCS_CC_APIGATEWAY_ROOT
+        # 所有接口共用的参数
+        common_kwargs = {
+            "module": self.MODULE,
+            "header_keys": ["X-BKAPI-AUTHORIZATION"],
+            "before_request": bcs_cc_before_request,
+        }
         self.get_cluster_config_by_cluster_id = DataAPI(
             method="GET",
             url=bcs_cc_url + "v1/clusters/{cluster_id}/cluster_config/",
-            module=self.MODULE,
             url_keys=["cluster_id"],
             description="根据集群id获取集群信息",
-            header_keys=["X-BKAPI-AUTHORIZATION"],
-            before_request=bcs_cc_before_request,
             after_request=bcs_get_cluster_config_after,
+            **common_kwargs,
         )
         self.get_cluster_by_cluster_id = DataAPI(
             method="GET",
             url=bcs_cc_url + "clusters/{cluster_id}/",
-            module=self.MODULE,
             url_keys=["cluster_id"],
             description="根据集群id获取集群信息",
-            header_keys=["X-BKAPI-AUTHORIZATION"],
-            before_request=bcs_cc_before_request,
+            **common_kwargs,
         )
         self.list_cluster = DataAPI(
             method="GET",
             url=bcs_cc_url + "cluster_list/",
-            module=self.MODULE,
-            before_request=bcs_cc_before_request,
-            header_keys=["X-BKAPI-AUTHORIZATION"],
+            **common_kwargs,
         )
         self.list_area = DataAPI(
             method="GET",
             url=bcs_cc_url + "areas/",
-            module=self.MODULE,
-            before_request=bcs_cc_before_request,
-            header_keys=["X-BKAPI-AUTHORIZATION"],
+            **common_kwargs,
         )
         self.list_project = DataAPI(
             method="GET",
             url=bcs_cc_url + "projects/",
-            module=self.MODULE,
-            before_request=bcs_cc_before_request,
             after_request=list_project_after,
-            header_keys=["X-BKAPI-AUTHORIZATION"],
             cache_time=60,
+            **common_kwargs,
         )
         self.list_shared_clusters_ns = DataAPI(
             method="GET",
             url=bcs_cc_url + "shared_clusters/{cluster_id}/",
-            module=self.MODULE,
             url_keys=["cluster_id"],
             description="获取公共集群下的命名空间信息",
-            header_keys=["X-BKAPI-AUTHORIZATION"],
-            before_request=bcs_cc_before_request,
+            **common_kwargs,
         )
@@ -83,9 +83,11 @@ class CheckCollectorHandler:
             try:
                 # "0:ip1,0:ip2,1:ip3"
                 ip_list = []
-                hosts = self.hosts.split(",")
-                for host in hosts:
-                    ip_list.append({"bk_cloud_id": int(host.split(":")[0]), "ip": host.split(":")[1]})
+                for host in self.hosts.split(","):
+                    bk_cloud_id, separator, ip = host.partition(":")
+                    if not separator:
+                        raise ValueError(host)
+                    ip_list.append({"bk_cloud_id": int(bk_cloud_id), "ip": ip})
                 self.target_server = {"ip_list": ip_list}
             except Exception as e:  # pylint: disable=broad-except
                 self.record.append_error_info(
@@ -0,0 +1,57 @@
+# -*- coding: utf-8 -*-
+"""
+Tencent is pleased to support the open source community by making BK-LOG 蓝鲸日志平台 available.
+Copyright (C) 2021 THL A29 Limited, a Tencent company.  All rights reserved.
+BK-LOG 蓝鲸日志平台 is licensed under the MIT License.
+License for BK-LOG 蓝鲸日志平台:
+--------------------------------------------------------------------
+Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated
+documentation files (the "Software"), to deal in the Software without restriction, including without limitation
+the rights to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software,
+and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+The above copyright notice and this permission notice shall be included in all copies or substantial
+portions of the Software.
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT
+LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN
+NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY,
+WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE
+SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+We undertake not to change the open source license (MIT license) applicable to the current version of
+the project delivered to anyone in the future.
+"""
+from unittest import TestCase
+from unittest.mock import patch
+
+from apps.api.modules import bcs_cc
+
+ACCESS_TOKEN = "test_access_token"
+ACCESS_TOKEN_RESULT = {"access_token": ACCESS_TOKEN, "expires_in": 7200}
+SHORT_EXPIRES_ACCESS_TOKEN_RESULT = {"access_token": ACCESS_TOKEN, "expires_in": 60}
+
+
+class TestBkSSMAccessToken(TestCase):
+    def setUp(self) -> None:
+        bcs_cc._TOKEN_CACHE.update({"value": None, "exp": 0.0})
+
+    def tearDown(self) -> None:
+        bcs_cc._TOKEN_CACHE.update({"value": None, "exp": 0.0})
+
+    @patch("apps.api.modules.bcs_cc.BkSSMApi.get_access_token", return_value=ACCESS_TOKEN_RESULT)
+    def test_cache_miss(self, get_access_token):
+        self.assertEqual(bcs_cc.get_bkssm_access_token(), ACCESS_TOKEN)
+        get_access_token.assert_called_once()
+        self.assertEqual(bcs_cc._TOKEN_CACHE["value"], ACCESS_TOKEN)
+
+    @patch("apps.api.modules.bcs_cc.BkSSMApi.get_access_token", return_value=ACCESS_TOKEN_RESULT)
+    def test_cache_hit(self, get_access_token):
+        bcs_cc.get_bkssm_access_token()
+        self.assertEqual(bcs_cc.get_bkssm_access_token(), ACCESS_TOKEN)
+        get_access_token.assert_called_once()
+
+    @patch("apps.api.modules.bcs_cc.BkSSMApi.get_access_token", return_value=SHORT_EXPIRES_ACCESS_TOKEN_RESULT)
+    def test_short_expires_not_cached(self, get_access_token):
+        # 有效期不超过提前过期时间时不缓存, 每次都重新获取
+        self.assertEqual(bcs_cc.get_bkssm_access_token(), ACCESS_TOKEN)
+        self.assertEqual(bcs_cc.get_bkssm_access_token(), ACCESS_TOKEN)
+        self.assertEqual(get_access_token.call_count, 2)
+        self.assertIsNone(bcs_cc._TOKEN_CACHE["value"])
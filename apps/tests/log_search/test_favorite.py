@@ -276,6 +276,89 @@ INSPECT_KEYWORD_RESULT = {
     "keyword": "log: ERROR AND log: [* TO 200] AND time: [100 TO *] OR log: [* TO 100]",
 }
 
+CHINESE_PUNCTUATION_KEYWORD = "log: “ERROR” AND “hello world”"
+INSPECT_CHINESE_PUNCTUATION_RESULT = {
+    "is_legal": False,
+    "is_resolved": True,
+    "message": "中文标点异常",
+    "keyword": 'log: "ERROR" AND "hello world"',
+}
+
+# 只有单词开头的范围运算符才会被识别, 单词中间的运算符属于单词本身
+RANGE_OPERATOR_KEYWORD = "a: >=5 AND b: x>5 AND x: a>=b>=c"
+RANGE_OPERATOR_KEYWORD_FIELDS = [
+    {
+        "pos": 0,
+        "name": "a",
+        "type": "Word",
+        "operator": ">=",
+        "value": "5",
+        "is_full_text_field": False,
+        "repeat_count": 0,
+    },
+    {
+        "pos": 11,
+        "name": "b",
+        "type": "Word",
+        "operator": "~=",
+        "value": "x>5",
+        "is_full_text_field": False,
+        "repeat_count": 0,
+    },
+    {
+        "pos": 22,
+        "name": "x",
+        "type": "Word",
+        "operator": "~=",
+        "value": "a>=b>=c",
+        "is_full_text_field": False,
+        "repeat_count": 0,
+    },
+]
+UPDATE_RANGE_OPERATOR_QUERY_PARAMS = [{"pos": 0, "value": "10"}, {"pos": 11, "value": "ZZ"}]
+EXPECT_NEW_RANGE_OPERATOR_QUERY = "a: >=10 AND b: ZZ AND x: a>=b>=c"
+
+# 括号不匹配修复, 移除括号后只去除其后部分的空白
+UNMATCHED_BRACKET_KEYWORD = "a: [1 TO 2] AND b: ( c"
+INSPECT_UNMATCHED_BRACKET_RESULT = {
+    "is_legal": False,
+    "is_resolved": True,
+    "message": "括号不匹配",
+    "keyword": "a: [1 TO 2] AND b: c",
+}
+
+# RANGE语法修复: 保留开区间括号, ERROR中的OR不作为分隔符, 起止值可包含冒号, TO需为独立单词
+INSPECT_RANGE_KEYWORD_RESULTS = [
+    (
+        "a: {1 TO 2",
+        {"is_legal": False, "is_resolved": True, "message": "非法RANGE语法", "keyword": "a: {1 TO 2]"},
+    ),
+    (
+        "log: ERROR AND a: [TO 5",
+        {"is_legal": False, "is_resolved": True, "message": "非法RANGE语法", "keyword": "log: ERROR AND a: [* TO 5]"},
+    ),
+    (
+        "time: [2020-01-01T00:00:00 TO",
+        {"is_legal": False, "is_resolved": True, "message": "非法RANGE语法", "keyword": "time: [2020-01-01T00:00:00 TO *]"},
+    ),
+    (
+        "msg: TODO AND a: [1 TO",
+        {"is_legal": False, "is_resolved": True, "message": "非法RANGE语法", "keyword": "msg: TODO AND a: [1 TO *]"},
+    ),
+    (
+        'a: ["x y" TO 2',
+        {"is_legal": False, "is_resolved": True, "message": "非法RANGE语法", "keyword": 'a: ["x y" TO 2]'},
+    ),
+    (
+        'a: [1 TO "x y"',
+        {"is_legal": False, "is_resolved": True, "message": "非法RANGE语法", "keyword": 'a: [1 TO "x y"]'},
+    ),
+    (
+        "a: [1TO2",
+        {"is_legal": False, "is_resolved": True, "message": "非法RANGE语法", "keyword": "a: [1 TO 2]"},
+    ),
+]
+
 
 # 类全局使用USERNAME_1
 @patch("apps.models.get_request_username", lambda: USERNAME_1)
@@ -428,6 +511,18 @@ class TestLucene(TestCase):
         """测试更新Lucene Query"""
         self.assertEqual(FavoriteHandler().generate_query_by_ui(KEYWORD, UPDATE_QUERY_PARAMS), EXPECT_NEW_QUERY)
 
+    def test_get_search_fields_with_range_operator(self):
+        """测试单词中的范围运算符"""
+        search_fields_result = FavoriteHandler().get_search_fields(keyword=RANGE_OPERATOR_KEYWORD)
+        self.assertEqual(search_fields_result, RANGE_OPERATOR_KEYWORD_FIELDS)
+
+    def test_update_query_with_range_operator(self):
+        """测试更新带范围运算符的Lucene Query"""
+        self.assertEqual(
+            FavoriteHandler().generate_query_by_ui(RANGE_OPERATOR_KEYWORD, UPDATE_RANGE_OPERATOR_QUERY_PARAMS),
+            EXPECT_NEW_RANGE_OPERATOR_QUERY,
+        )
+
     def test_inspect(self):
         """测试解析关键字"""
         inspect_result = LuceneSyntaxResolver(keyword=ILLEGAL_KEYWORD).resolve()
@@ -437,3 +532,18 @@ class TestLucene(TestCase):
         self.assertEqual(
             sorted(inspect_result["message"].split("\n")), sorted(INSPECT_KEYWORD_RESULT["message"].split("\n"))
         )
+
+    def test_inspect_chinese_punctuation(self):
+        """测试中文引号转换"""
+        inspect_result = LuceneSyntaxResolver(keyword=CHINESE_PUNCTUATION_KEYWORD).resolve()
+        self.assertDictEqual(inspect_result, INSPECT_CHINESE_PUNCTUATION_RESULT)
+
+    def test_inspect_unmatched_bracket(self):
+        """测试修复括号不匹配"""
+        inspect_result = LuceneSyntaxResolver(keyword=UNMATCHED_BRACKET_KEYWORD).resolve()
+        self.assertDictEqual(inspect_result, INSPECT_UNMATCHED_BRACKET_RESULT)
+
+    def test_inspect_range(self):
+        """测试修复RANGE语法"""
+        for keyword, result in INSPECT_RANGE_KEYWORD_RESULTS:
+            self.assertDictEqual(LuceneSyntaxResolver(keyword=keyword).resolve(), result)
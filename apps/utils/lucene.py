@@ -1,7 +1,7 @@
 import re
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass
 from typing import List
-from collections import Counter, deque
+from collections import Counter, defaultdict
 
 from luqum.exceptions import ParseSyntaxError, IllegalCharacterError
 from luqum.visitor import TreeTransformer
@@ -29,12 +29,59 @@ from apps.exceptions import UnknownLuceneOperatorException
 from apps.log_databus.constants import TargetNodeTypeEnum
 from apps.log_search.constants import DEFAULT_BK_CLOUD_ID, OperatorEnum
 
+# 左括号集合以及右括号到左括号的映射
+_OPEN_BRACKETS = frozenset(BRACKET_DICT)
+_CLOSE_TO_OPEN_BRACKETS = {close: open_ for open_, close in BRACKET_DICT.items()}
+_BRACKETS = _OPEN_BRACKETS | frozenset(_CLOSE_TO_OPEN_BRACKETS)
+
+# RANGE运算符, 按 [int(include_low)][int(include_high)] 取值
+_RANGE_OPERATORS = tuple(
+    tuple(LOW_CHAR[include_low] + HIGH_CHAR[include_high] for include_high in (False, True))
+    for include_low in (False, True)
+)
+
+# 单词前缀的范围运算符, 长的在前以保证 >= 先于 > 匹配
+_WORD_RANGE_OPERATORS = tuple(sorted(WORD_RANGE_OPERATORS.split("|"), key=len, reverse=True))
+
+# 未知操作符修复器, 解析状态只保存在每次调用的context中, 可全局复用
+_UNKNOWN_OPERATION_RESOLVER = UnknownOperationResolver()
+
+# 预编译正则, 避免每次检查时重复编译
+# 中文引号正则
+_CHINESE_PUNCT_RE = re.compile(r"(“.*?”)")
+# 非法字符正则
+_ILLEGAL_CHAR_RE = re.compile(r"Illegal character '(.*)' at position (\d+)")
+# 非预期字符正则
+_UNEXPECT_WORD_RE = re.compile(r"Syntax error in input : unexpected  '(.*)' at position (\d+)")
+# RANGE语法正则, 匹配字段冒号后到下一个逻辑运算符前的 RANGE 语句, 括号及起止值均可缺失
+_RANGE_RE = re.compile(
+    r'(?P<colon>:\s*)(?P<low>[\[{]?)\s*(?P<start>"[^"]*"|\S*?)\s*(?<![A-Za-z])TO(?![A-Za-z])'
+    r'(?:\s*(?P<end>"[^"]*"|[^\s\]}]+?))?\s*?(?P<high>[\]}]?)'
+    r"(?=\s*(?:\bAND\b|\bOR\b|$))"
+)
+
 
 def get_node_lucene_syntax(node):
     """获取该节点lucene语法类型"""
     return node.__class__.__name__
 
 
+def get_word_range_operator(value: str) -> str:
+    """获取单词开头的范围运算符, 没有则返回空字符串"""
+    for operator in _WORD_RANGE_OPERATORS:
+        if value.startswith(operator):
+            return operator
+    return ""
+
+
+def parse_keyword(keyword: str) -> dict:
+    """解析关键字, 返回语法树以及解析异常, 供各检查器共享"""
+    try:
+        return {"tree": parser.parse(keyword, lexer=lexer), "error": None}
+    except Exception as e:  # pylint: disable=broad-except
+        return {"tree": None, "error": e}
+
+
 @dataclass
 class LuceneField(object):
     """Lucene解析出的Field类"""
@@ -57,32 +104,41 @@ class LuceneParser(object):
     def __init__(self, keyword: str) -> None:
         self.keyword = keyword
 
-    def parsing(self) -> List[LuceneField]:
-        """解析lucene语法入口函数"""
-        tree = parser.parse(self.keyword, lexer=lexer)
-        fields = self._get_method(tree)
-        if isinstance(fields, list):
-            # 以下逻辑为同名字段增加额外标识符
-            names = Counter([field.name for field in fields])
-            if not names:
-                return fields
-            for name, cnt in names.items():
-                if cnt > 1:
-                    number = 1
-                    for field in fields:
-                        if field.name == name:
-                            field.name = f"{name}({number})"
-                            field.repeat_count = number
-                            number += 1
+    def parsing(self, tree=None) -> List[LuceneField]:
+        """解析lucene语法入口函数, 已有语法树时可直接传入避免重复解析"""
+        if tree is None:
+            tree = parser.parse(self.keyword, lexer=lexer)
+        fields = self._walk(tree)
+        # 以下逻辑为同名字段增加额外标识符
+        names = Counter([field.name for field in fields])
+        repeat_names = {name for name, cnt in names.items() if cnt > 1}
+        if not repeat_names:
             return fields
-
-        return [fields]
+        numbers = defaultdict(int)
+        for field in fields:
+            if field.name in repeat_names:
+                numbers[field.name] += 1
+                field.repeat_count = numbers[field.name]
+                field.name = f"{field.name}({field.repeat_count})"
+        return fields
 
     def _get_method(self, node):
         """获取解析方法"""
-        node_type = get_node_lucene_syntax(node)
-        method_name = "parsing_{}".format(node_type.lower())
-        return getattr(self, method_name)(node)
+        return self.PARSING_METHODS[type(node).__name__](self, node)
+
+    def _walk(self, node) -> List[LuceneField]:
+        """以显式栈代替递归遍历分组及逻辑运算节点, 按从左到右的顺序收集字段"""
+        fields = []
+        stack = [node]
+        while stack:
+            node = stack.pop()
+            node_type = type(node).__name__
+            if node_type in self.COMPOUND_SYNTAX:
+                # 逆序入栈, 保证子节点按原顺序出栈
+                stack.extend(reversed(node.children))
+                continue
+            fields.append(self.PARSING_METHODS[node_type](self, node))
+        return fields
 
     def parsing_word(self, node):
         """解析单词"""
@@ -94,11 +150,10 @@ class LuceneParser(object):
             value=node.value,
             is_full_text_field=True,
         )
-        match = re.search(WORD_RANGE_OPERATORS, node.value)
-        if match:
-            operator = match.group(0)
+        operator = get_word_range_operator(node.value)
+        if operator:
             field.operator = operator
-            field.value = node.value.split(operator)[-1]
+            field.value = node.value[len(operator) :]
         return field
 
     def parsing_phrase(self, node):
@@ -134,19 +189,12 @@ class LuceneParser(object):
 
     def parsing_group(self, node):
         """"""
-        fields = []
-        for children in node.children:
-            children_fields = self._get_method(children)
-            if isinstance(children_fields, list):
-                fields.extend(children_fields)
-            else:
-                fields.append(children_fields)
-        return fields
+        return self._walk(node)
 
     def parsing_range(self, node):
         """"""
         field = LuceneField(pos=node.pos, type=LuceneSyntaxEnum.RANGE, value=str(node))
-        field.operator = "{}{}".format(LOW_CHAR[node.include_low], HIGH_CHAR[node.include_high])
+        field.operator = _RANGE_OPERATORS[int(node.include_low)][int(node.include_high)]
         return field
 
     def parsing_fuzzy(self, node):
@@ -173,25 +221,11 @@ class LuceneParser(object):
 
     def parsing_oroperation(self, node):
         """解析或操作"""
-        fields = []
-        for operand in node.operands:
-            operand_fields = self._get_method(operand)
-            if isinstance(operand_fields, list):
-                fields.extend(operand_fields)
-            else:
-                fields.append(operand_fields)
-        return fields
+        return self._walk(node)
 
     def parsing_andoperation(self, node):
         """"""
-        fields = []
-        for operand in node.operands:
-            operand_fields = self._get_method(operand)
-            if isinstance(operand_fields, list):
-                fields.extend(operand_fields)
-            else:
-                fields.append(operand_fields)
-        return fields
+        return self._walk(node)
 
     def parsing_not(self, node):
         """"""
@@ -233,6 +267,28 @@ class LuceneParser(object):
         """解析未知操作"""
         raise UnknownLuceneOperatorException()
 
+    # 包含子节点, 需要展开遍历的节点类型
+    COMPOUND_SYNTAX = frozenset([LuceneSyntaxEnum.GROUP, LuceneSyntaxEnum.AND_OPERATION, LuceneSyntaxEnum.OR_OPERATION])
+
+    # 节点类型 -> 解析方法
+    PARSING_METHODS = {
+        LuceneSyntaxEnum.WORD: parsing_word,
+        LuceneSyntaxEnum.PHRASE: parsing_phrase,
+        LuceneSyntaxEnum.SEARCH_FIELD: parsing_searchfield,
+        LuceneSyntaxEnum.FIELD_GROUP: parsing_fieldgroup,
+        LuceneSyntaxEnum.GROUP: parsing_group,
+        LuceneSyntaxEnum.RANGE: parsing_range,
+        LuceneSyntaxEnum.FUZZY: parsing_fuzzy,
+        LuceneSyntaxEnum.REGEX: parsing_regex,
+        LuceneSyntaxEnum.PROXIMITY: parsing_proximity,
+        LuceneSyntaxEnum.OR_OPERATION: parsing_oroperation,
+        LuceneSyntaxEnum.AND_OPERATION: parsing_andoperation,
+        LuceneSyntaxEnum.NOT: parsing_not,
+        LuceneSyntaxEnum.PLUS: parsing_plus,
+        LuceneSyntaxEnum.PROHIBIT: parsing_prohibit,
+        LuceneSyntaxEnum.UNKNOWN: parsing_unknownoperation,
+    }
+
 
 class LuceneTransformer(TreeTransformer):
     """Lucene语句转换器"""
@@ -241,14 +297,11 @@ class LuceneTransformer(TreeTransformer):
         """SEARCH_FIELD 类型转换"""
         if node.pos == context["pos"]:
             name, value = node.name, context["value"]
+            operator = ""
             if get_node_lucene_syntax(node.expr) == LuceneSyntaxEnum.WORD:
-                operator = LuceneParser(keyword=str(node)).parsing()[0].operator
-                if operator in WORD_RANGE_OPERATORS:
-                    node = parser.parse(f"{name}: {operator}{value}", lexer=lexer)
-                else:
-                    node = parser.parse(f"{name}: {value}", lexer=lexer)
-            else:
-                node = parser.parse(f"{name}: {value}", lexer=lexer)
+                # 与 LuceneParser.parsing_word 一致, 保留单词前的范围运算符
+                operator = get_word_range_operator(node.expr.value)
+            node = parser.parse(f"{name}: {operator}{value}", lexer=lexer)
 
         yield from self.generic_visit(node, context)
 
@@ -289,27 +342,35 @@ class BaseInspector(object):
         self.result.is_legal = False
         self.result.message = self.syntax_error_message
 
-    def inspect(self):
-        """检查"""
+    @classmethod
+    def need_inspect(cls, keyword: str) -> bool:
+        """根据关键字中是否出现相关字符快速判断是否需要检查, 返回False时可跳过该检查器"""
+        return True
+
+    def inspect(self, parse_state: dict):
+        """检查, parse_state为当前关键字的解析结果: {"tree": 语法树, "error": 解析异常}"""
         raise NotImplementedError
 
+    def remove_character(self, position: int, length: int = 1):
+        """移除指定位置的字符"""
+        self.keyword = self.keyword[:position] + self.keyword[position + length :]
+
     def remove_unexpected_character(self, match):
         """根据RE match来移除异常字符"""
-        unexpect_word_len = len(match[1])
+        unexpect_word = match[1]
         position = int(str(match[2]))
         # "127.0.0.1 这种单个引号在开头的情况，需要移除引号
-        if match[1].startswith('"') and not match[1].endswith('"'):
-            self.keyword = self.keyword[:position] + self.keyword[position + 1 :]
-            return
-        if match[1].startswith("'") and not match[1].endswith("'"):
-            self.keyword = self.keyword[:position] + self.keyword[position + 1 :]
-            return
-        self.keyword = self.keyword[:position] + self.keyword[position + unexpect_word_len :]
+        for quote in ('"', "'"):
+            if unexpect_word.startswith(quote) and not unexpect_word.endswith(quote):
+                self.remove_character(position)
+                return
+        self.remove_character(position, len(unexpect_word))
         self.keyword = self.keyword.strip()
 
-    def replace_unexpected_character(self, pos: int, char: str):
-        """替换字符"""
-        self.keyword[pos] = char
+    @staticmethod
+    def replace_unexpected_character(chars: list, pos: int, char: str):
+        """在字符列表上原地替换字符, 多处替换完成后再统一拼接回关键字"""
+        chars[pos] = char
 
 
 class ChinesePunctuationInspector(BaseInspector):
@@ -317,16 +378,30 @@ class ChinesePunctuationInspector(BaseInspector):
 
     syntax_error_message = _("中文标点异常")
 
-    chinese_punctuation_re = r"(“.*?”)"
+    chinese_punctuation_re = _CHINESE_PUNCT_RE
+    chinese_left_quote = "“"
+
+    @classmethod
+    def has_chinese_punctuation(cls, keyword: str) -> bool:
+        """是否存在中文引号, 不含中文左引号时无需执行正则"""
+        return cls.need_inspect(keyword) and cls.chinese_punctuation_re.search(keyword) is not None
 
-    def inspect(self):
-        p = re.compile(self.chinese_punctuation_re)
-        match_groups = [m for m in p.finditer(self.keyword)]
-        if not match_groups:
+    @classmethod
+    def need_inspect(cls, keyword: str) -> bool:
+        return cls.chinese_left_quote in keyword
+
+    def inspect(self, parse_state: dict):
+        if not self.need_inspect(self.keyword):
+            return
+        chars = list(self.keyword)
+        is_replaced = False
+        for m in self.chinese_punctuation_re.finditer(self.keyword):
+            self.replace_unexpected_character(chars, m.start(), '"')
+            self.replace_unexpected_character(chars, m.end() - 1, '"')
+            is_replaced = True
+        if not is_replaced:
             return
-        for m in p.finditer(self.keyword):
-            self.replace_unexpected_character(m.start(), '"')
-            self.replace_unexpected_character(m.end(), '"')
+        self.keyword = "".join(chars)
         self.set_illegal()
 
 
@@ -336,25 +411,21 @@ class IllegalCharacterInspector(BaseInspector):
     syntax_error_message = _("异常字符")
 
     # 非法字符正则
-    illegal_character_re = r"Illegal character '(.*)' at position (\d+)"
+    illegal_character_re = _ILLEGAL_CHAR_RE
     # 非预期字符正则
-    unexpect_word_re = r"Syntax error in input : unexpected  '(.*)' at position (\d+)"
-
-    def inspect(self):
-        try:
-            parser.parse(self.keyword, lexer=lexer)
-        except IllegalCharacterError as e:
-            match = re.search(self.illegal_character_re, str(e))
-            if match:
-                self.remove_unexpected_character(match)
-                self.set_illegal()
-        except ParseSyntaxError as e:
-            match = re.search(self.unexpect_word_re, str(e))
-            if match:
-                self.remove_unexpected_character(match)
-                self.set_illegal()
-        except Exception:
+    unexpect_word_re = _UNEXPECT_WORD_RE
+
+    def inspect(self, parse_state: dict):
+        error = parse_state["error"]
+        if isinstance(error, IllegalCharacterError):
+            match = self.illegal_character_re.search(str(error))
+        elif isinstance(error, ParseSyntaxError):
+            match = self.unexpect_word_re.search(str(error))
+        else:
             return
+        if match:
+            self.remove_unexpected_character(match)
+            self.set_illegal()
 
 
 class IllegalRangeSyntaxInspector(BaseInspector):
@@ -363,37 +434,30 @@ class IllegalRangeSyntaxInspector(BaseInspector):
     syntax_error_message = _("非法RANGE语法")
 
     # RANGE语法正则
-    range_re = r":[\s]?[\[]?.*?TO.*"
+    range_re = _RANGE_RE
 
-    def inspect(self):
-        try:
-            parser.parse(self.keyword, lexer=lexer)
-        except Exception:
-            new_keyword = self.keyword
-            for i in self.keyword.split("AND"):
-                for keyword_slice in i.split("OR"):
-                    match = re.search(self.range_re, keyword_slice)
-                    if not match:
-                        continue
-                    match_range_str = match.string.split(":")[-1].strip()
-                    new_match_range_str = match_range_str
-                    if not new_match_range_str.startswith("["):
-                        new_match_range_str = "[" + new_match_range_str
-                    if not new_match_range_str.endswith("]"):
-                        new_match_range_str = new_match_range_str + "]"
-                    start, end = new_match_range_str[1:-1].split("TO")
-                    start = start.strip()
-                    end = end.strip()
-                    if not start:
-                        start = "*"
-                    if not end:
-                        end = "*"
-                    new_range_str = f"[{start} TO {end}]"
-                    new_keyword = new_keyword.replace(match_range_str, new_range_str).strip()
-
-            if self.keyword != new_keyword:
-                self.set_illegal()
-            self.keyword = new_keyword
+    @classmethod
+    def need_inspect(cls, keyword: str) -> bool:
+        return "TO" in keyword
+
+    def inspect(self, parse_state: dict):
+        if parse_state["error"] is None:
+            return
+        new_keyword = self.range_re.sub(self.fix_range, self.keyword)
+        if self.keyword != new_keyword:
+            self.keyword = new_keyword.strip()
+            self.set_illegal()
+
+    @staticmethod
+    def fix_range(match) -> str:
+        """补全缺失的括号以及起止值"""
+        return "{colon}{low}{start} TO {end}{high}".format(
+            colon=match["colon"],
+            low=match["low"] or "[",
+            start=match["start"] or "*",
+            end=match["end"] or "*",
+            high=match["high"] or "]",
+        )
 
 
 class IllegalBracketInspector(BaseInspector):
@@ -405,38 +469,41 @@ class IllegalBracketInspector(BaseInspector):
         "Syntax error in input : unexpected end of expression (maybe due to unmatched parenthesis) at the end!"
     )
 
-    def inspect(self):
-        try:
-            parser.parse(self.keyword, lexer=lexer)
-        except ParseSyntaxError as e:
-            if str(e) == self.unexpect_unmatched_re:
-                s = deque()
-                for index in range(len(self.keyword)):
-                    symbol = self.keyword[index]
-                    # 左括号入栈
-                    if symbol in BRACKET_DICT.keys():
-                        s.append({"symbol": symbol, "index": index})
-                        continue
-                    if symbol in BRACKET_DICT.values():
-                        if s and symbol == BRACKET_DICT.get(s[-1]["symbol"], ""):
-                            # 右括号出栈
-                            s.pop()
-                            continue
-                        s.append({"symbol": symbol, "index": index})
-                        # 如果栈首尾匹配, 则异常的括号是栈顶向下第二个
-                        if s[-1]["symbol"] == BRACKET_DICT.get(s[0]["symbol"], ""):
-                            self.keyword = self.keyword[: s[-2]["index"]] + self.keyword[s[-2]["index"] + 1 :]
-                        # 否则异常的括号是栈顶元素
-                        else:
-                            self.keyword = self.keyword[: s[-1]["index"]] + self.keyword[s[-1]["index"] + 1 :]
-                        self.set_illegal()
-                        return
-                if not s:
-                    return
-                self.keyword = self.keyword[: s[-1]["index"]] + self.keyword[s[-1]["index"] + 1 :].strip()
+    @classmethod
+    def need_inspect(cls, keyword: str) -> bool:
+        return not _BRACKETS.isdisjoint(keyword)
+
+    def inspect(self, parse_state: dict):
+        error = parse_state["error"]
+        if not isinstance(error, ParseSyntaxError) or str(error) != self.unexpect_unmatched_re:
+            return
+        # 栈元素为 (括号, 位置)
+        stack = []
+        for index, symbol in enumerate(self.keyword):
+            # 左括号入栈
+            if symbol in _OPEN_BRACKETS:
+                stack.append((symbol, index))
+                continue
+            if symbol in _CLOSE_TO_OPEN_BRACKETS:
+                if stack and stack[-1][0] == _CLOSE_TO_OPEN_BRACKETS[symbol]:
+                    # 右括号出栈
+                    stack.pop()
+                    continue
+                # 如果栈底的左括号与当前右括号匹配, 则异常的括号是栈顶元素
+                if stack and stack[0][0] == _CLOSE_TO_OPEN_BRACKETS[symbol]:
+                    _, position = stack[-1]
+                # 否则异常的括号是当前右括号
+                else:
+                    position = index
+                self.remove_character(position)
                 self.set_illegal()
-        except Exception:
+                return
+        if not stack:
             return
+        _, position = stack[-1]
+        # 只去除被移除括号之后部分的空白
+        self.keyword = self.keyword[:position] + self.keyword[position + 1 :].strip()
+        self.set_illegal()
 
 
 class IllegalColonInspector(BaseInspector):
@@ -448,45 +515,46 @@ class IllegalColonInspector(BaseInspector):
         "Syntax error in input : unexpected end of expression (maybe due to unmatched parenthesis) at the end!"
     )
 
-    def inspect(self):
-        try:
-            parser.parse(self.keyword, lexer=lexer)
-        except ParseSyntaxError as e:
-            if str(e) == self.unexpect_unmatched_re:
-                if self.keyword.find(":") == len(self.keyword) - 1:
-                    self.keyword = self.keyword[:-1].strip()
-                    self.set_illegal()
-        except Exception:
+    @classmethod
+    def need_inspect(cls, keyword: str) -> bool:
+        return keyword.endswith(":")
+
+    def inspect(self, parse_state: dict):
+        error = parse_state["error"]
+        if not isinstance(error, ParseSyntaxError) or str(error) != self.unexpect_unmatched_re:
             return
+        if self.keyword.find(":") == len(self.keyword) - 1:
+            self.keyword = self.keyword[:-1].strip()
+            self.set_illegal()
 
 
 class IllegalOperatorInspector(BaseInspector):
     """修复非法运算符"""
 
     syntax_error_message = _("非法逻辑运算符(AND, OR, NOT)")
-    unexpect_operators = ["AND", "OR", "NOT"]
+    unexpect_operators = ("AND", "OR", "NOT")
     # 非预期语法re
     unexpect_unmatched_re = (
         "Syntax error in input : unexpected end of expression (maybe due to unmatched parenthesis) at the end!"
     )
 
-    def inspect(self):
-        try:
-            parser.parse(self.keyword, lexer=lexer)
-        except ParseSyntaxError as e:
-            if str(e) != self.unexpect_unmatched_re:
-                return
-            for operator in self.unexpect_operators:
-                if operator not in self.keyword:
-                    continue
-                _operator_pos = self.keyword.find(operator)
-                if _operator_pos == len(self.keyword) - len(operator):
-                    self.keyword = self.keyword[:_operator_pos].strip()
-                    self.set_illegal()
-                    # 单次修复
-                    break
-        except Exception:
+    @classmethod
+    def need_inspect(cls, keyword: str) -> bool:
+        return keyword.endswith(cls.unexpect_operators)
+
+    def inspect(self, parse_state: dict):
+        error = parse_state["error"]
+        if not isinstance(error, ParseSyntaxError) or str(error) != self.unexpect_unmatched_re:
             return
+        for operator in self.unexpect_operators:
+            if operator not in self.keyword:
+                continue
+            _operator_pos = self.keyword.find(operator)
+            if _operator_pos == len(self.keyword) - len(operator):
+                self.keyword = self.keyword[:_operator_pos].strip()
+                self.set_illegal()
+                # 单次修复
+                break
 
 
 class UnknownOperatorInspector(BaseInspector):
@@ -494,15 +562,11 @@ class UnknownOperatorInspector(BaseInspector):
 
     syntax_error_message = _("未知操作符")
 
-    def inspect(self):
-        try:
-            parser.parse(self.keyword, lexer=lexer)
-        except UnknownLuceneOperatorException:
-            resolver = UnknownOperationResolver()
-            self.keyword = str(resolver(parser.parse(self.keyword, lexer=lexer)))
-            self.set_illegal()
-        except Exception:
+    def inspect(self, parse_state: dict):
+        if not isinstance(parse_state["error"], UnknownLuceneOperatorException):
             return
+        self.keyword = str(_UNKNOWN_OPERATION_RESOLVER(parser.parse(self.keyword, lexer=lexer)))
+        self.set_illegal()
 
 
 class DefaultInspector(BaseInspector):
@@ -510,11 +574,13 @@ class DefaultInspector(BaseInspector):
 
     syntax_error_message = _("未知异常")
 
-    def inspect(self):
+    def inspect(self, parse_state: dict):
+        if parse_state["error"] is not None:
+            self.set_illegal()
+            return
         try:
-            parser.parse(self.keyword, lexer=lexer)
-            LuceneParser(keyword=self.keyword).parsing()
-        except Exception:
+            LuceneParser(keyword=self.keyword).parsing(tree=parse_state["tree"])
+        except Exception:  # pylint: disable=broad-except
             self.set_illegal()
 
 
@@ -535,30 +601,54 @@ class LuceneSyntaxResolver(object):
 
     def __init__(self, keyword: str):
         self.keyword = keyword
-        self.messages = []
+        # 用dict去重并保留检查出的先后顺序
+        self.messages = {}
 
-    def inspect(self):
+    def inspect(self, parse_state: dict = None):
         messages = []
+        # 关键字未被修改时各检查器共享同一份解析结果
+        if parse_state is None:
+            parse_state = parse_keyword(self.keyword)
         for inspector_class in self.REGISTERED_INSPECTORS:
+            if not inspector_class.need_inspect(self.keyword):
+                continue
             inspector = inspector_class(self.keyword)
-            inspector.inspect()
-            self.keyword = inspector.keyword
+            inspector.inspect(parse_state)
+            if inspector.keyword != self.keyword:
+                self.keyword = inspector.keyword
+                parse_state = parse_keyword(self.keyword)
             result = inspector.get_result()
             if not result.is_legal:
-                messages.append(str(asdict(result)["message"]))
+                messages.append(str(result.message))
         if not messages:
             return True
-        self.messages.extend(messages)
+        self.messages.update(dict.fromkeys(messages))
+
+    def is_legal_keyword(self, parse_state: dict) -> bool:
+        """关键字能否直接解析, 中文引号即使能被解析也需要经过检查器转换"""
+        if parse_state["error"] is not None:
+            return False
+        if ChinesePunctuationInspector.has_chinese_punctuation(self.keyword):
+            return False
+        try:
+            LuceneParser(keyword=self.keyword).parsing(tree=parse_state["tree"])
+        except Exception:  # pylint: disable=broad-except
+            return False
+        return True
 
     def resolve(self):
-        is_resolved = False
-        for i in range(MAX_RESOLVE_TIMES):
-            if self.inspect():
-                is_resolved = True
-                break
-        self.messages = set(self.messages)
-        if is_resolved and str(DefaultInspector.syntax_error_message) in self.messages:
-            self.messages.remove(str(DefaultInspector.syntax_error_message))
+        parse_state = parse_keyword(self.keyword)
+        # 关键字本身合法时, 跳过所有检查器
+        is_resolved = self.is_legal_keyword(parse_state)
+        if not is_resolved:
+            for i in range(MAX_RESOLVE_TIMES):
+                # 首轮检查复用预检的解析结果
+                if self.inspect(parse_state):
+                    is_resolved = True
+                    break
+                parse_state = None
+        if is_resolved:
+            self.messages.pop(str(DefaultInspector.syntax_error_message), None)
         return {
             "is_legal": False if self.messages else True,
             "is_resolved": is_resolved,